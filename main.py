@@ -27,6 +27,9 @@ Algorithm to mine disjunctive frequent itemsets
   (Step 5)    For each such itemset, check if the itemset is a subset of any
           maximal infrequent itemset:
           - if NO: Use the FP Tree Property to find the support of the itemset.
+          The order of the traversal ensures that no subset of an infrequent
+          itemset visited earlier is generated, so this check needs no extra
+          lookup.
 
   (Step 6)    If the itemset has support value greater than the min support
           threshold, then we add the itemset to the frequent itemset list,
@@ -40,10 +43,9 @@ Algorithm to mine disjunctive frequent itemsets
 """
 
 import sys
-from collections import defaultdict, namedtuple, OrderedDict
-from copy import deepcopy
-from operator import itemgetter, attrgetter
-from queue import *
+from array import array
+from collections import Counter, deque, namedtuple
+from operator import itemgetter
 
 __author__ = 'Nihal Jain (nihal.jain@iitg.ernet.in)'
 __version__ = '0.3'
@@ -52,13 +54,20 @@ __date__ = '20160810'
 class FPNode(object):
     """Blueprint of a node in the FPTree"""
 
+    # a tree may contain millions of nodes, so store the attributes in slots instead of a per node dictionary
+    __slots__ = ('_tree', '_item', '_count', '_parent', '_children', '_neighbour', '_nodeID')
+
+    # most nodes have only a few children, so the children of a node are kept in a list of nodes which is scanned
+    # linearly, and only converted to a dictionary keyed by item once it grows beyond this many children
+    maxChildrenList = 8
+
     def __init__(self, tree, item, nodeID, count=1):
         """Function to initialise all the attributes of a FPTree node"""
         self._tree = tree
         self._item = item
         self._count = count
         self._parent = None
-        self._children = {}
+        self._children = []
         self._neighbour = None
         self._nodeID = nodeID
 
@@ -84,8 +93,11 @@ class FPNode(object):
 
     @property
     def children(self):
-        """Returns the nodes which are children of this node"""
-        return tuple(self._children.values())
+        """Returns the nodes which are children of this node, as a read only sequence or view. Wrap it in a tuple if
+        children may be added to this node while iterating over it"""
+        if type(self._children) is dict:
+            return self._children.values()
+        return tuple(self._children)
 
     @property
     def neighbour(self):
@@ -136,22 +148,38 @@ class FPNode(object):
     def searchChildren(self, item):
         """Check whether this node has a node representing item as a child.
         If yes, then return that node, otherwise return None"""
-        try:
-            return self._children[item]
-        except KeyError:
-            return None
+        if type(self._children) is dict:
+            return self._children.get(item)
+
+        for childNode in self._children:
+            if childNode._item == item:
+                return childNode
+        return None
 
     def addChild(self, childNode):
         """Function to add a node as child node of this node"""
         if childNode is not None and not isinstance(childNode, FPNode):
             raise TypeError("The child node of a node must be a FPNode")
 
-        if not childNode.item in self._children:
+        if self.searchChildren(childNode.item) is None:
+            self._appendChild(childNode)
+
+    def _appendChild(self, childNode):
+        """Function to add a node as child node of this node, when the caller has already checked that this node has no
+        child representing the same item"""
+        if type(self._children) is dict:
             self._children[childNode.item] = childNode
-            childNode.parent = self
+        else:
+            self._children.append(childNode)
+
+            # switch to a dictionary once the list of children becomes too long to scan
+            if len(self._children) > self.maxChildrenList:
+                self._children = dict((node.item, node) for node in self._children)
+
+        childNode.parent = self
 
     def __contains__(self, item):
-        return item in self._children
+        return self.searchChildren(item) is not None
 
     def inspect(self, depth=0):
         print(('  ' * depth) + repr(self))
@@ -172,6 +200,9 @@ class FPTree(object):
     """
     Header = namedtuple('Header', 'head tail')
 
+    # the layout of an FP Tree flattened into parallel lists indexed by node id, see buildFlatFPTree
+    Arrays = namedtuple('Arrays', 'parent item count neighbour head')
+
     def __init__(self):
         """Function to initialise all the attributes of a FPTree node"""
         # this attribute stores the root node of the tree
@@ -222,8 +253,8 @@ class FPTree(object):
                 # create a new FPNode representing the current item
                 nextNode = FPNode(self, item, self.nodesCount)
 
-                # add this new node as a children of the current node
-                currNode.addChild(nextNode)
+                # add this new node as a children of the current node, searchChildren above found no such child
+                currNode._appendChild(nextNode)
 
                 # update the header table and add a new entry for this new node in it
                 self.updateHeader(nextNode)
@@ -320,12 +351,27 @@ class FPTree(object):
                 print("     %r" % node)
 
 
+# the transactions of a dataset in compressed sparse row form: the items of all the transactions stored one after
+# another in items, where the items of transaction t run from offsets[t] up to offsets[t + 1]
+Transactions = namedtuple('Transactions', 'items offsets')
+
+
+def iterTransactions(transactions):
+    """Function to generate the items of each transaction, in order, from the given transactions"""
+    items, offsets = transactions
+    for t in range(len(offsets) - 1):
+        yield items[offsets[t]:offsets[t + 1]]
+
+
 def processDataset(filePath, numeric):
-    """Function to process the given dataset and generate a list of lists containing transactions and their
-    corresponding items"""
+    """Function to process the given dataset and generate the transactions it contains along with their corresponding
+    items. Numeric items are stored in a flat array of 32-bit integers, which falls back to a flat list of python
+    integers when an item does not fit in 32 bits. Other items are stored in a flat list"""
 
-    # create a list to store the transactions present in the dataset
-    transactions = []
+    # create a flat sequence to store the items of all the transactions present in the dataset, and an array storing the
+    # offset at which the items of each transaction start
+    items = array('i') if numeric else []
+    offsets = array('i', [0])
 
     # try to open the file and read its contents
     try:
@@ -350,50 +396,53 @@ def processDataset(filePath, numeric):
         # check if items are numerals
         if numeric:
 
-            # create a list to store the items present in a transaction
-            transaction = []
-
-            # convert each item into an integer and append it to the transaction
-            for item in line.split():
-                transaction.append(int(item))
+            # convert each item into an integer and append it to the items
+            transaction = list(map(int, line.split()))
+            if type(items) is list:
+                items.extend(transaction)
+            else:
+                # fromlist leaves the array unchanged if any of the items does not fit in it
+                try:
+                    items.fromlist(transaction)
 
-            # append the transaction to the list of transactions
-            transactions.append(transaction)
+                # if so, switch to a list of python integers for all the items
+                except OverflowError:
+                    items = list(items)
+                    items.extend(transaction)
 
         # if items are not numerals
         else:
-            #  after splitting the line into a list of items, append the items list to the transaction list
-            transactions.append(line.split())
+            #  after splitting the line into a list of items, append them to the items
+            items.extend(line.split())
+
+        # the next transaction starts after the items of this one
+        offsets.append(len(items))
+
+    transactions = Transactions(items, offsets)
 
     #printTransactions(transactions)
 
-    # return the list of lists containing the transactions
+    # return the transactions
     return transactions
 
 
 def printTransactions(transactions):
-    """Function to print the transactions present in the list of lists containing the transactions"""
-    for transaction in transactions:
+    """Function to print the transactions present in the given transactions"""
+    for transaction in iterTransactions(transactions):
         for item in transaction:
             print(str(item)+" ", end="", flush=True)
         print('.')
 
 
 def filterTransactions(transactions, minSupp, includeSupp=False):
-    """Function to filter out all items with support count less than minimum support. It returns a new list of
-     transactions containing only the items satisfying the minimum support threshold. Each newly created transaction,
-     within the list of transactions, stores items in a transaction ordered by frequency. Items with higher support
-     value come first in the item list of the transaction."""
-
-    # create a dictionary such that when a new key is encountered for the first time i.e. if it is already not there in
-    # the mapping, a new entry is automatically created using the default_factory function which returns 0.
-    itemsDict = defaultdict(lambda: 0)
-
-    # count the frequency of each item and increment it by 1 whenever it is encountered in a transaction
-    # a new key is created whenever an item is encountered for the first time, with its value set to 0
-    for transaction in transactions:
-        for item in transaction:
-            itemsDict[item] += 1
+    """Function to filter out all items with support count less than minimum support. It returns new transactions
+     containing only the items satisfying the minimum support threshold, with each item replaced by its index in the
+     items order, which is returned as well. Each newly created transaction stores items in a transaction ordered by
+     frequency. Items with higher support value come first in the item list of the transaction. If includeSupp is True, a
+     dictionary mapping each item to its support is returned as well."""
+
+    # count the frequency of each item, over the items of all the transactions at once
+    itemsDict = Counter(transactions.items)
 
     # debug
     #print(itemsDict)
@@ -408,54 +457,51 @@ def filterTransactions(transactions, minSupp, includeSupp=False):
     # debug
     #print("Item Dict:", itemsDict)
 
-    # order the dictionary based on the support of the items, use lexicographical order to break ties
-    itemsDictOrdered = OrderedDict(sorted(itemsDict.items(), key=itemgetter(1, 0), reverse=True))
+    # order the items based on their support, use lexicographical order to break ties
+    itemsSorted = sorted(itemsDict.items(), key=itemgetter(1, 0), reverse=True)
 
     # debug
-    #print("Ordered Item Dict:", itemsDictOrdered)
+    #print("Ordered Items:", itemsSorted)
 
-    itemsOrder = list(itemsDictOrdered.keys())
+    itemsOrder = [item for item, support in itemsSorted]
 
     # debug
     #print("Items Order", itemsOrder)
 
-    def cleanTransactions(transaction):
-        """Function to filter a transaction such that only those items remain which satisfy the minimum support
-        threshold and sort the items in a transaction based on their frequency, with items having higher support coming
-        first"""
-        # filter transaction and sustain only items which have an entry in the itemDict
-        transaction = list(filter(lambda v: v in itemsDictOrdered, transaction))
+    # map each item to its position in the items order. It also serves as the set of items to keep
+    itemsRank = {item: rank for rank, item in enumerate(itemsOrder)}
 
-        # sort the transaction containing a list of items in items order
-        transaction.sort(key=lambda v: itemsOrder.index(v))
+    # create the flat array of the items and the offsets of the cleaned transactions
+    items = array('i')
+    offsets = array('i', [0])
 
-        # return the new transaction
-        return transaction
+    # clean each transaction: sustain only items which have an entry in the itemsRank, replace them by their index in
+    # the items order, and sort them, so that items having higher support come first
+    for transaction in iterTransactions(transactions):
+        items.extend(sorted([itemsRank[v] for v in transaction if v in itemsRank]))
+        offsets.append(len(items))
 
-    # create a list to store the cleaned list of transactions
-    transactionsNew =  []
-
-    # map cleanTransactions function to each transaction present in the list of transactions
-    # i.e. clean each transaction
-    for transaction in map(cleanTransactions, transactions):
-        transactionsNew.append(transaction)
+    transactionsNew = Transactions(items, offsets)
 
     # debug
     #printTransactions(transactionsNew)
 
-    # return the newly created cleaned list of transactions
+    # return the newly created cleaned transactions, along with the support of each item if asked for
+    if includeSupp:
+        return transactionsNew, itemsOrder, dict(itemsSorted)
+
     return transactionsNew, itemsOrder
 
 
-def buildFPTree(transactions):
-    """Function to build a fp tree from the given list of transactions"""
+def buildFPTree(transactions, itemsOrder):
+    """Function to build a fp tree from the given transactions, whose items are given by their index in itemsOrder"""
 
     # initialise tree to be fp tree object
     tree = FPTree()
 
-    # insert each transaction in the transaction list to the fp tree
-    for transaction in transactions:
-        tree.addTransaction(transaction)
+    # insert each transaction in the transactions to the fp tree
+    for transaction in iterTransactions(transactions):
+        tree.addTransaction(map(itemsOrder.__getitem__, transaction))
 
     # debug : print the resulting fp tree
     #tree.inspect()
@@ -463,76 +509,232 @@ def buildFPTree(transactions):
     # return the object storing the resulting fp tree
     return tree
 
-def checkPath(itemList, i, X_node, tree, itemsOrder):
-    """Function to check whether the given prefix paths contains an item of the itemset. Returns True when item is a part
-    of the given prefix path"""
+def buildFlatFPTree(transactions, nItems):
+    """Function to build a fp tree from the given transactions directly in flattened form, without creating any FPNode.
+    The items of the transactions are given by their index in the items order, which holds nItems items. The tree is
+    returned as parallel lists indexed by node id, holding the parent, item, count and neighbour of each node, along
+    with a list holding the head of the path of each item. Node 0 is the root node and a missing parent, neighbour or
+    head is represented by -1"""
 
-    # set found to be false
-    found = False
+    # create the lists with the entry of the root node
+    parent = [-1]
+    item = [-1]
+    count = [0]
+    neighbour = [-1]
 
-    # check if at index is valid and corresponds to an item in the itemset
-    if i >= 0:
+    # create the lists holding the head and the tail of the path of each item
+    head = [-1] * nItems
+    tail = [-1] * nItems
 
-        # find the parent node of the gicen X_node
-        Y_node = X_node.parent
+    # create a dictionary which maps a (node id, item) pair to the node id of the child representing that item
+    children = {}
 
-        # repeat while
-        while Y_node != tree.root:
-            # check whether the item represented by current node is same as the item at index i in the given itemset
-            if Y_node.item == itemList[i]:
+    # insert each transaction in the transactions to the fp tree
+    for transaction in iterTransactions(transactions):
+        # set the root of the tree as the current node
+        currNode = 0
 
-                # if items are same, set found to be true
-                found = True
+        for rank in transaction:
+            # search for a node representing the current item in the children of the current node
+            nextNode = children.get((currNode, rank))
 
-                # break out of the current loop
-                break
-            # otherwise if the index of the item represented by Y_node in the items order is less than the order of the
-            # i item in that list
-            elif itemsOrder.index(Y_node.item) < itemsOrder.index(itemList[i]):
-                # break
-                break
+            # if found, increment the count of that node by 1
+            if nextNode is not None:
+                count[nextNode] += 1
 
-            # set Y_node's parent to be the new Y_node
-            Y_node = Y_node.parent
+            # otherwise create a new node representing the current item as a child of the current node
+            else:
+                nextNode = len(parent)
+                children[(currNode, rank)] = nextNode
+                parent.append(currNode)
+                item.append(rank)
+                count.append(1)
+                neighbour.append(-1)
+
+                # add the new node at the end of the path of the current item
+                if tail[rank] == -1:
+                    head[rank] = nextNode
+                else:
+                    neighbour[tail[rank]] = nextNode
+                tail[rank] = nextNode
+
+            # set the current node to be next node, and process the next item in the transaction
+            currNode = nextNode
 
-        # if item not found, move to the parent of the current Y_node
-        if not found:
-            found = checkPath(itemList, i - 1, X_node, tree, itemsOrder)
-    else:
-        # if not found, set found to false
-        found = False
+    return FPTree.Arrays(parent, item, count, neighbour, head)
 
-    # returns whether item found in the prefix path of the given node
-    return found
+def buildBitmaps(transactions, itemsOrder):
+    """Function to build a vertical bitmap for every item in the given transactions, whose items are given by their
+    index in itemsOrder. Bit t of the bitmap of an item is set when the item is present in transaction t, so the bitmaps
+    are stored as python integers"""
 
+    # number of bytes needed to store one bit per transaction
+    nBytes = (len(transactions.offsets) - 1 + 7) // 8
 
-def findSupportByPrefixPath(newList, tree, itemsOrder):
-    """Function to find the support of given itemsets by using prefix path method"""
+    # create a bytearray for each item, with one bit per transaction
+    bitmapBytes = [bytearray(nBytes) for item in itemsOrder]
+
+    # set the bit corresponding to the transaction id in the bytearray of each item present in that transaction
+    for tid, transaction in enumerate(iterTransactions(transactions)):
+        for rank in transaction:
+            bitmapBytes[rank][tid >> 3] |= 1 << (tid & 7)
+
+    # convert each bytearray into an integer so that the bitmaps can be combined using the C level bitwise operators
+    return dict((item, int.from_bytes(bitmap, 'little')) for item, bitmap in zip(itemsOrder, bitmapBytes))
+
+
+def findSubsetSupportsByBitmap(itemsList, indices, bitmaps):
+    """Function to find the supports of the itemsets obtained by removing the item at each of the given indices from the
+    given itemset, using the vertical bitmaps of its items. The disjunctive support of an itemset is the number of
+    transactions containing at least one of its items i.e. the number of bits set in the union of the bitmaps of its
+    items"""
+
+    # union of the bitmaps of the items after index j, for every index j
+    suffixUnions = [0] * (len(itemsList) + 1)
+    for j in range(len(itemsList) - 1, -1, -1):
+        suffixUnions[j] = suffixUnions[j + 1] | bitmaps[itemsList[j]]
+
+    # union of the bitmaps of the items before index j, for every index j
+    prefixUnions = [0] * len(itemsList)
+    for j in range(1, len(itemsList)):
+        prefixUnions[j] = prefixUnions[j - 1] | bitmaps[itemsList[j - 1]]
+
+    # the union of the bitmaps of the itemset without item i is the union of the items before and after it, return the
+    # number of transactions in each such union
+    return [bin(prefixUnions[i] | suffixUnions[i + 1]).count('1') for i in indices]
+
+
+def checkPath(itemList, i, Y_node, root, itemsRank):
+    """Function to check whether the path from Y_node up to the root node contains an item of the itemset at index 0
+    to i. Returns the node representing the first such item found along with its index in the itemset, or (None, -1)
+    when the path has none of these items. itemsRank maps each item to its index in the items order"""
+
+    # the items of the itemset and the items on the path are both in decreasing order of their index in the items order
+    # when read from index i and from Y_node upwards respectively, so walk up the path once while moving down the
+    # itemset, and stop at the first common item. The slots of the nodes are read directly rather than through their
+    # properties, as this is the innermost loop of the prefix path method
+    while i >= 0 and Y_node is not root:
+        # index of the item represented by Y_node and of the item at index i in the items order
+        nodeRank = itemsRank[Y_node._item]
+        itemRank = itemsRank[itemList[i]]
+
+        # check whether the item represented by current node is same as the item at index i in the given itemset
+        if nodeRank == itemRank:
+            return Y_node, i
+
+        # otherwise if the index of the item represented by Y_node in the items order is less than the order of the
+        # i item in that list, item i is not on the path, so move to the previous item in the itemset
+        elif nodeRank < itemRank:
+            i -= 1
+
+        # otherwise set Y_node's parent to be the new Y_node
+        else:
+            Y_node = Y_node._parent
+
+    # returns that no item is found in the path
+    return None, -1
 
-    # initialise the support value to be 0
-    support = 0
+
+def findSubsetSupportsByPrefixPath(itemsList, indices, tree, itemsRank):
+    """Function to find the supports of the itemsets obtained by removing the item at each of the given indices from the
+    given itemset, by using prefix path method. A node representing item k of the itemset counts towards the support of
+    a subset when its prefix path holds no item of that subset before item k, so the paths of the items are walked once
+    for all the subsets together. itemsRank maps each item to its index in the items order"""
+
+    # count of the nodes whose prefix path holds no item of the itemset before their own item, which count towards the
+    # support of every subset except the one without their own item
+    common = 0
+
+    # for each index j, count of such nodes representing item j
+    excluded = [0] * len(itemsList)
+
+    # for each index j, count of the nodes whose prefix path holds item j as the only item of the itemset before their
+    # own item, which count towards the support of the subset without item j only
+    only = [0] * len(itemsList)
+
+    # header table and root node of the tree
+    header = tree._header
+    root = tree._root
 
     # loop over each element in the itemset
-    for k in range(len(newList)):
+    for k in range(len(itemsList)):
 
         # set the x node to point to the head of x node in the header table
-        X_node = tree._header[newList[k]][0]
+        X_node = header[itemsList[k]][0]
+
+        # while we donot reach the end of the path
+        while X_node is not None:
 
-        # while we donot reach the root node
-        while X_node != None:
+            # find the first item of the itemset before item k on the prefix path of X_node
+            Y_node, j = checkPath(itemsList, k - 1, X_node._parent, root, itemsRank)
 
-            # check whether the given path has the given item in it
-            found = checkPath(newList, k - 1, X_node, tree, itemsOrder)
+            if Y_node is None:
+                common += X_node._count
+                excluded[k] += X_node._count
 
-            # if not found add the count of X_node to the support count
-            if not found:
-                support += X_node.count
+            # if there is one, check whether the prefix path holds a second such item further up
+            elif checkPath(itemsList, j - 1, Y_node._parent, root, itemsRank)[0] is None:
+                only[j] += X_node._count
 
             # set the X_node's neighbour to be the new X_node
-            X_node = X_node.neighbour
+            X_node = X_node._neighbour
+
+    # return the support value of each subset
+    return [common - excluded[i] + only[i] for i in indices]
+
+
+def checkFlatPath(ranks, i, Y_node, parent, item):
+    """Function to check whether the path from Y_node up to the root node of the flat fp tree contains an item at
+    index 0 to i of the itemset given by ranks. Works like checkPath, returning (0, -1) when the path has none of these
+    items"""
+    while i >= 0 and Y_node != 0:
+        if item[Y_node] == ranks[i]:
+            return Y_node, i
+        elif item[Y_node] < ranks[i]:
+            i -= 1
+        else:
+            Y_node = parent[Y_node]
+    return 0, -1
+
+
+def findSubsetSupportsByArrays(itemsList, indices, arrays, itemsRank):
+    """Function to find the supports of the itemsets obtained by removing the item at each of the given indices from the
+    given itemset, by using prefix path method on the flat fp tree. It works like findSubsetSupportsByPrefixPath, but
+    follows node ids through the lists of the flat tree instead of FPNode objects"""
+    parent, item, count, neighbour, head = arrays
+
+    # replace the items of the itemset by their index in the items order
+    ranks = [itemsRank[x] for x in itemsList]
+
+    # counts of the nodes with no item, and with exactly one item, of the itemset before their own on the prefix path
+    common = 0
+    excluded = [0] * len(ranks)
+    only = [0] * len(ranks)
+
+    # loop over each element in the itemset
+    for k in range(len(ranks)):
+
+        # set the x node to point to the head of x node in the header table
+        X_node = head[ranks[k]]
+
+        # while we do not reach the end of the path
+        while X_node != -1:
+
+            # find the first item of the itemset before item k on the prefix path of X_node, the root node has node id 0
+            Y_node, j = checkFlatPath(ranks, k - 1, parent[X_node], parent, item)
+
+            if j == -1:
+                common += count[X_node]
+                excluded[k] += count[X_node]
+            elif checkFlatPath(ranks, j - 1, parent[Y_node], parent, item)[1] == -1:
+                only[j] += count[X_node]
+
+            # set the X_node's neighbour to be the new X_node
+            X_node = neighbour[X_node]
+
+    # return the support value of each subset
+    return [common - excluded[i] + only[i] for i in indices]
 
-    # return the support value of the given itemset
-    return support
 
 def findSupportByBFS(newList, tree):
     """Function to calculate the support of the given itemset using the fp tree by traversing the fp tree in breadth
@@ -540,125 +742,108 @@ def findSupportByBFS(newList, tree):
     # initialise the support to be  0
     support = 0
 
-    # crteat an empty list which store true false depending on whether the node at index i has been visited by bfs
-    # search
-    visited = []
+    # create a bytearray which stores whether the node at index i has been visited by bfs search, with number of nodes
+    # + 1 elements set to false by default
+    visited = bytearray(tree.nodesCount + 1)
 
-    # make number of node + 1 elements in the list and set them to be false by default
-    for i in range(tree.nodesCount + 1):
-        visited.append(False)
-
-    # create an empty queue q
-    q = Queue(maxsize=0)
+    # create a set of the items in the itemset, to check in constant time whether a node represents one of them, and
+    # keep its membership test in a local name as it is called once per node
+    inItemset = frozenset(newList).__contains__
 
     # set the first node i.e. the root node as visited
     visited[0] = True
 
-    # push the root of the fp tree to the queue q
-    q.put(tree.root)
+    # create a queue q and push the root of the fp tree to it
+    q = deque([tree.root])
 
     # repeat until the queue is not empty
-    while not q.empty():
+    while q:
         # pop the queue and extract a node and make it the source node
-        srcNode = q.get()
+        srcNode = q.popleft()
         #print("SRC:", srcNode.nodeID)
 
-        # set the children nodes to be a list of nodes which are the children of the source node
-        childrenNodes = srcNode.children
-
-        # sort the list of children based on their support counts, in order of decreasing supports, breaking ties by
-        # following lexicographical order
-        sorted(childrenNodes , key=attrgetter('item'), reverse=True)
-        sorted( childrenNodes , key=attrgetter('count'), reverse=True)
-
-        # process each node in the list of children nodes
-        for node in childrenNodes:
-
-            # set flag to be false meaning that the item has not been found
-            foundFlag = False
+        # process each node in the list of children nodes of the source node
+        for node in srcNode.children:
 
             # if the current child node is not visited before
-            if not visited[node.nodeID]:
-                # for each item in the list of items in the items
-                for item in newList:
-                    # check whether the node represented by the current node equals the current item in the itemset
-                    if item == node.item:
-                        # if so, add the count of that node to the support value
-                        support += node.count
-
-                        # set flag to be true meaning that the item is found
-                        foundFlag = True
-
-                        # break the loop if node represents this item
-                        break
-
-                # if item is found, continue to the next iteration of the for loop
-                if foundFlag == True:
+            if not visited[node._nodeID]:
+                # check whether the current node represents an item in the itemset
+                if inItemset(node._item):
+                    # if so, add the count of that node to the support value and continue to the next node, as the
+                    # transactions below this node are already counted
+                    support += node._count
                     continue
 
                 # set the current node to visited
-                visited[node.nodeID] = True
+                visited[node._nodeID] = True
                 #print("Visited:", node.nodeID)
 
                 # put this node into the queue
-                q.put(node)
+                q.append(node)
 
     # after processing all the nodes in bfs order, return the support
     return support
 
-def generateItemsets(itemsList, start, end, depth, minSupp, fpt, itemsOrder, freqItemsets):
-    """Function to find all the frequent itemset of the current itemset"""
-    # set i to be the start index
-    i = start
+def generateItemsets(itemsList, start, end, depth, minSupp, findSubsetSupports, freqItemsets, itemsSupp, suppBound):
+    """Function to find all the frequent itemset of the current itemset. findSubsetSupports is a function which takes an
+    itemset and a list of indices, and returns the supports of the itemsets obtained by removing the item at each of
+    those indices from it. itemsSupp maps each item to its support and suppBound is the sum of the supports of the items
+    in the current itemset"""
+    # if we are depth end + 1, return
+    if depth == end + 1:
+        return
 
-    # repeat while i lies between start and end (inclusive)
-    while i >= end:
-        # if we are depth end + 1, return
-        if depth == end + 1:
-            return
+    # debug
+    #print("Itemset before removal is: ", itemsList)
 
-        #list of items in the current itemset
-        newList = deepcopy(itemsList)
+    # the support of an itemset is at most the sum of the supports of its items, so keep only the indices i between
+    # start and end (inclusive) for which that sum is at least the minimum support once item i is removed, the other
+    # itemsets are infrequent and there is no need to find their support
+    indices = [i for i in range(start, end - 1, -1) if suppBound - itemsSupp[itemsList[i]] >= minSupp]
+    if not indices:
+        return
 
-        # debug
-        #print("Itemset before removal is: ", itemsList)
+    # no lookup in a table of infrequent itemsets is needed before finding the support: the itemsets are visited
+    # by removing items in decreasing order of their index, so every superset of the current itemset that was
+    # visited earlier is one of its ancestors in the recursion, all of which are frequent. Hence no subset of an
+    # infrequent itemset visited earlier is generated, and such a table would never be hit
+
+    # find the supports of all these itemsets together, as they share all but one of their items
+    supports = findSubsetSupports(itemsList, indices)
 
-        # remove item i from the current itemset
-        newList.remove(itemsList[i])
+    for i, val in zip(indices, supports):
+        # tuple of items in the current itemset i.e. the items of the itemset with item i removed
+        newList = itemsList[:i] + itemsList[i + 1:]
 
         # debug
         #print("Removed item i: ", i, "Current itemset is: ",i temsList[i])
 
-        # find the support of current itemset
-        val = findSupportByPrefixPath(newList, fpt, itemsOrder)
-        #val = findSupportByBFS(newList, fpt)
-
         # if support of current itemset is greater than minimum support
         if (val >= minSupp):
             # debug
             #print("Added to frequent itemset list: ", newList, " With support: ", val)
 
-            # append this frequent item into the list of frequent items
-            freqItemsets.append({str(newList):val})
+            # append this frequent itemset along with its support into the list of frequent itemsets
+            freqItemsets.append((newList, val))
 
             # generate the next itemset by decrementing the value of i and depth by 1
-            generateItemsets(deepcopy(newList), i - 1, end, depth - 1, minSupp, fpt, itemsOrder, freqItemsets)
-
-        # decrement the value of i by 1
-        i -= 1
+            generateItemsets(newList, i - 1, end, depth - 1, minSupp, findSubsetSupports, freqItemsets, itemsSupp,
+                             suppBound - itemsSupp[itemsList[i]])
 
-def findFrequentItemsets(fpt, itemsOrder, minSupp):
-    """"Function to find all the frequent itemsets in the fp tree, which is a consdensed representation of the given
-    dataset"""
+def findFrequentItemsets(itemsOrder, itemsSupp, minSupp, findSubsetSupports):
+    """"Function to find all the frequent itemsets over the given items, using findSubsetSupports to compute the
+    supports of the subsets of an itemset from a condensed representation of the given dataset. itemsSupp maps each
+    item to its support"""
     # create an empty list to store the set of frequent itemsets
     freqItemsets = []
 
     # call generate itemsets function to find frequent itemsets
-    generateItemsets(itemsOrder, len(itemsOrder) - 1, 0, len(itemsOrder), minSupp, fpt, itemsOrder, freqItemsets)
+    generateItemsets(tuple(itemsOrder), len(itemsOrder) - 1, 0, len(itemsOrder), minSupp, findSubsetSupports,
+                     freqItemsets, itemsSupp, sum(itemsSupp[item] for item in itemsOrder))
 
     print("Total " + str(len( freqItemsets)) + " frequent ORed Itemsets found.")
 
-    # return the list of all frequent itemsets
+    # return the list of all frequent itemsets, as (tuple of items, support) pairs
     return freqItemsets
 
 if __name__ == '__main__':
@@ -667,7 +852,7 @@ if __name__ == '__main__':
     # import the OptionParser module which will be used to parse the options passed as argument
 
     # start the timer
-    startTime = time.clock()
+    startTime = time.perf_counter()
 
     # initialise OptionParser object and pass a string which will be used to display usage
     opt = OptionParser(usage='%scriptName datasetPath')
@@ -678,12 +863,20 @@ if __name__ == '__main__':
     # add an option to choose whether to use numbers to represent items
     opt.add_option('-n', '--numeric', dest='numeric', action='store_true', help='Convert the values in the dataset to '
                                                                                 'numerals (default = false)')
+    # add an option to choose the method used to compute the support of an itemset
+    opt.add_option('-m', '--method', dest='method', type='choice', choices=['bitmap', 'prefix', 'array', 'bfs'],
+                   help='Method used to find the support of an itemset: bitmap, prefix, array or bfs '
+                        '(default = bitmap)')
+
     # set minimum support to 2, by default, if no option passed as  parameter
     opt.set_defaults(minSupp=2)
 
     # set numeric to false, by default, if no option passed as parameter
     opt.set_defaults(numeric=False)
 
+    # use vertical bitmaps to find the support of an itemset, by default, if no option passed as parameter
+    opt.set_defaults(method='bitmap')
+
     # parse the arguments passed to the program into options and args
     options, args = opt.parse_args()
 
@@ -699,29 +892,54 @@ if __name__ == '__main__':
     print('Parameters are as follows....')
     print('Dataset File Path: ' + str(args[0]))
     print('Minimum Support Threshold: ' + str(options.minSupp))
+    print('Support Method: ' + options.method)
     print('-------------------------------------------------------------------')
 
     # create a list to store the transactions present in the dataset
     transactions = []
 
-    # process the dataset, and retrieve a list of lists containing a list of transactions and corresponding items
+    # process the dataset, and retrieve the transactions and their corresponding items
     transactions = processDataset(args[0], options.numeric)
 
     # create a list to store all the frequent itemsets
     result = []
 
     # process the list of transactions and generate a list of frequent itemsets
-    transactions, itemsOrder = filterTransactions(transactions, options.minSupp)
+    transactions, itemsOrder, itemsSupp = filterTransactions(transactions, options.minSupp, True)
+
+    if options.method == 'bitmap':
+        # build the vertical bitmaps of the items for the passed list of transactions
+        bitmaps = buildBitmaps(transactions, itemsOrder)
+        findSubsetSupports = lambda itemset, indices: findSubsetSupportsByBitmap(itemset, indices, bitmaps)
 
-    # build the fp tree for the passed list of transactions
-    tree = buildFPTree(transactions)
+    elif options.method == 'bfs':
+        # build the fp tree for the passed list of transactions
+        tree = buildFPTree(transactions, itemsOrder)
+        findSubsetSupports = lambda itemset, indices: [findSupportByBFS(itemset[:i] + itemset[i + 1:], tree)
+                                                       for i in indices]
+
+    else:
+        # map each item to its index in the items order, to compare the order of two items in constant time
+        itemsRank = {item: rank for rank, item in enumerate(itemsOrder)}
+
+        if options.method == 'array':
+            # build the fp tree for the passed list of transactions as lists indexed by node id
+            arrays = buildFlatFPTree(transactions, len(itemsOrder))
+            findSubsetSupports = lambda itemset, indices: findSubsetSupportsByArrays(itemset, indices, arrays,
+                                                                                     itemsRank)
+
+        else:
+            # build the fp tree for the passed list of transactions
+            tree = buildFPTree(transactions, itemsOrder)
+            findSubsetSupports = lambda itemset, indices: findSubsetSupportsByPrefixPath(itemset, indices, tree,
+                                                                                         itemsRank)
 
-    # find frequent itemsets for the given tree
-    freqItemsets = findFrequentItemsets(tree, itemsOrder, options.minSupp)
+    # find frequent itemsets using the chosen support method
+    freqItemsets = findFrequentItemsets(itemsOrder, itemsSupp, options.minSupp, findSubsetSupports)
 
     # debug
-    #for itemset in freqItemsets:
-    #    print(itemset)
+    #for itemset, support in freqItemsets:
+    #    print(list(itemset), support)
 
     # end the timer and print the total execution time
-    print(time.clock() - startTime, "seconds")
+    print(time.perf_counter() - startTime, "seconds")